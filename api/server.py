@@ -1,4 +1,10 @@
 # api/server.py
+#
+# Run with:
+#     uvicorn api.server:app --reload
+# (uvicorn's default --loop auto picks uvloop when it is installed; the event
+# loop is created by uvicorn before this module is imported, so it cannot be
+# selected from here.)
 
 import asyncio
 
@@ -63,7 +69,8 @@ async def get_state():
 @app.get("/parts")
 async def get_parts():
     """
-    Return a list of parts currently known by the Digital Twin.
+    Return the parts currently in the system plus the most recently
+    sorted ones (bounded history).
     Each entry contains: part_id, status, last_timestamp.
     """
     parts = await twin.get_parts_snapshot()
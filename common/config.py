@@ -3,58 +3,94 @@
 from __future__ import annotations
 
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SimulationConfig:
     part_interarrival: Tuple[float, float]
     sensor_delay: Tuple[float, float]
     actuator_delay: Tuple[float, float]
     ok_probability: float
+    num_workers: int = 8
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TwinConfig:
     blocked_threshold: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     simulation: SimulationConfig
     twin: TwinConfig
 
 
+# Parsed configs keyed by resolved path -> (mtime, size, config).
+# Bounded LRU so repeated reloads do not re-parse an unchanged file.
+_CFG_CACHE_MAX = 100
+_CFG_CACHE: OrderedDict[str, Tuple[float, int, AppConfig]] = OrderedDict()
+
+
+# Fallback configuration, built once (the config dataclasses are frozen)
+_DEFAULT_CONFIG = AppConfig(
+    simulation=SimulationConfig(
+        part_interarrival=(0.5, 1.5),
+        sensor_delay=(0.1, 0.3),
+        actuator_delay=(0.1, 0.2),
+        ok_probability=0.8,
+        num_workers=8,
+    ),
+    twin=TwinConfig(
+        blocked_threshold=5.0,
+    ),
+)
+_default_warned = False
+
+
 def _default_config() -> AppConfig:
     """Fallback configuration if config.yaml is missing or invalid."""
-    logger.warning("Using default configuration (no config.yaml found or parse error).")
-    return AppConfig(
-        simulation=SimulationConfig(
-            part_interarrival=(0.5, 1.5),
-            sensor_delay=(0.1, 0.3),
-            actuator_delay=(0.1, 0.2),
-            ok_probability=0.8,
-        ),
-        twin=TwinConfig(
-            blocked_threshold=5.0,
-        ),
-    )
+    global _default_warned
+    if not _default_warned:
+        logger.warning("Using default configuration (no config.yaml found or parse error).")
+        _default_warned = True
+    return _DEFAULT_CONFIG
 
 
 def load_config(path: str | Path = "config.yaml") -> AppConfig:
+    """
+    Load the application config from a YAML file.
+
+    The parsed result is cached and reused until the file's mtime or size
+    changes. The returned object is shared between callers: do not mutate it.
+    """
     cfg_path = Path(path)
-    if not cfg_path.exists():
+    try:
+        st = cfg_path.stat()
+    except OSError:
         return _default_config()
 
+    key = str(cfg_path.resolve())
+    cached = _CFG_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime and cached[1] == st.st_size:
+        _CFG_CACHE.move_to_end(key)
+        return cached[2]
+
     try:
         with cfg_path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=_Loader) or {}
     except Exception as exc:
         logger.error("Failed to parse config file %s: %s", cfg_path, exc)
         return _default_config()
@@ -66,17 +102,25 @@ def load_config(path: str | Path = "config.yaml") -> AppConfig:
     sensor_delay = tuple(sim_cfg.get("sensor_delay", [0.1, 0.3]))
     actuator_delay = tuple(sim_cfg.get("actuator_delay", [0.1, 0.2]))
     ok_prob = float(sim_cfg.get("ok_probability", 0.8))
+    num_workers = int(sim_cfg.get("num_workers", 8))
 
     blocked_threshold = float(twin_cfg.get("blocked_threshold", 5.0))
 
-    return AppConfig(
+    config = AppConfig(
         simulation=SimulationConfig(
             part_interarrival=(float(part_interarrival[0]), float(part_interarrival[1])),
             sensor_delay=(float(sensor_delay[0]), float(sensor_delay[1])),
             actuator_delay=(float(actuator_delay[0]), float(actuator_delay[1])),
             ok_probability=ok_prob,
+            num_workers=num_workers,
         ),
         twin=TwinConfig(
             blocked_threshold=blocked_threshold,
         ),
     )
+
+    _CFG_CACHE[key] = (st.st_mtime, st.st_size, config)
+    _CFG_CACHE.move_to_end(key)
+    if len(_CFG_CACHE) > _CFG_CACHE_MAX:
+        _CFG_CACHE.popitem(last=False)
+    return config
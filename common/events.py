@@ -1,27 +1,40 @@
 # common/events.py
 
-from enum import Enum
+from enum import IntEnum
 from dataclasses import dataclass
 from typing import Dict, Any
 
 
-class EventType(Enum):
-    """Types of events exchanged between the physical cell and the digital twin."""
-    PART_ARRIVED = "part_arrived"
-    SENSOR_READ = "sensor_read"
-    ACTUATOR_TRIGGERED = "actuator_triggered"
-    PART_SORTED = "part_sorted"
+class EventType(IntEnum):
+    """
+    Types of events exchanged between the physical cell and the digital twin.
+
+    Values are small contiguous ints so they can index lookup tables;
+    `label` gives the readable name used in logs and JSON.
+    """
+    PART_ARRIVED = 0
+    SENSOR_READ = 1
+    ACTUATOR_TRIGGERED = 2
+    PART_SORTED = 3
 
+    @property
+    def label(self) -> str:
+        return self.name.lower()
 
-@dataclass
+
+@dataclass(slots=True)
 class Event:
     """
-    Generic event structure.
+    Generic event structure (slotted: no per-instance __dict__).
 
     - type: category of the event (from EventType)
-    - timestamp: simulation time (float) or real time in seconds
+    - timestamp: monotonic time in integer nanoseconds (time.monotonic_ns())
     - data: payload with event-specific information (e.g. part_id, result, etc.)
     """
     type: EventType
-    timestamp: float
+    timestamp: int
     data: Dict[str, Any]
+
+
+# Conversion factor from Event timestamps (ns) to seconds
+NS_TO_S = 1e-9
@@ -1,6 +1,12 @@
 # common/logging_config.py
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
 
 
 def configure_logging(level: int = logging.INFO) -> None:
@@ -8,8 +14,30 @@ def configure_logging(level: int = logging.INFO) -> None:
     Configure root logging for the project.
 
     This should be called once at startup (CLI or API).
+    Records are passed through a queue to a background listener thread
+    that writes them to stderr, so the asyncio loop never blocks on
+    console output. Later calls are no-ops.
+    An explicit datefmt (whole seconds) skips the extra millisecond
+    formatting the default asctime performs on every record.
     """
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter(
+            "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
     )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener.start()
+    # Flush pending records on interpreter exit
+    atexit.register(_listener.stop)
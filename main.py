@@ -1,6 +1,12 @@
 # main.py
 
 import asyncio
+import logging
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 from twin_core.event_bus import EventBus
 from twin_core.twin import DigitalTwin
@@ -8,6 +14,8 @@ from physical_sim.cell_sim import SortingCellSimulator
 from common.logging_config import configure_logging
 from common.config import load_config
 
+logger = logging.getLogger(__name__)
+
 
 async def main_async() -> None:
     # Configure logging
@@ -27,12 +35,14 @@ async def main_async() -> None:
     # Start the physical simulation
     sim_task = asyncio.create_task(sim.run())
 
-    # Simple monitoring task: periodically print twin state
+    # Simple monitoring task: periodically log twin state
+    # (through the queued logging handler, so console I/O never blocks the loop;
+    # like every other log record it goes to stderr)
     async def monitor():
         while True:
             await asyncio.sleep(2.0)
             snapshot = await twin.get_state_snapshot()
-            print("[MONITOR]", snapshot)
+            logger.info("[MONITOR] %s", snapshot)
 
     monitor_task = asyncio.create_task(monitor())
 
@@ -41,4 +51,7 @@ async def main_async() -> None:
 
 
 if __name__ == "__main__":
+    # Prefer the libuv-based event loop when installed
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main_async())
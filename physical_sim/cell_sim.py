@@ -3,15 +3,39 @@
 import asyncio
 import random
 import logging
-from typing import Tuple, Optional
+import math
+from time import monotonic_ns
+from typing import Callable, List, Tuple, Optional
 
-from common.events import Event, EventType
+from common.events import NS_TO_S, Event, EventType
 from twin_core.event_bus import EventBus
 from common.config import SimulationConfig
 
 logger = logging.getLogger(__name__)
 
 
+def _make_uniform_sampler(
+    bounds: Tuple[float, float], random_fn: Callable[[], float]
+) -> Callable[[], float]:
+    """
+    Build a zero-argument sampler equivalent to uniform(lo, hi).
+
+    The function is generated at runtime so lo and span are compiled in as
+    constants and random_fn is a default argument (a local inside).
+    """
+    lo, hi = float(bounds[0]), float(bounds[1])
+    span = hi - lo
+    if not (math.isfinite(lo) and math.isfinite(span)):
+        raise ValueError(f"Invalid delay range: {bounds!r}")
+    src = (
+        "def sample(_random=_random):\n"
+        f"    return {lo!r} + {span!r} * _random()\n"
+    )
+    namespace = {"_random": random_fn}
+    exec(src, namespace)
+    return namespace["sample"]
+
+
 class SortingCellSimulator:
     """
     Asynchronous simulation of a simple sorting cell:
@@ -20,6 +44,11 @@ class SortingCellSimulator:
     - A sensor evaluates each part as "ok" or "nok".
     - An actuator sends the part to the appropriate bin.
     - Events are published to the EventBus at each step.
+    - Parts are processed by a fixed pool of worker coroutines; arrivals
+      wait when every worker is busy and the hand-off queue is full.
+      num_workers (simulation.num_workers in config.yaml) therefore bounds
+      throughput: when processing is slow, parts arrive less often than
+      part_interarrival says.
 
     This plays the role of the "physical" system in our Digital Twin.
     """
@@ -32,6 +61,7 @@ class SortingCellSimulator:
         sensor_delay: Tuple[float, float] = (0.1, 0.3),
         actuator_delay: Tuple[float, float] = (0.1, 0.2),
         ok_probability: float = 0.8,
+        num_workers: int = 8,
     ) -> None:
         self._bus = bus
 
@@ -41,6 +71,7 @@ class SortingCellSimulator:
             self.sensor_delay = sim_config.sensor_delay
             self.actuator_delay = sim_config.actuator_delay
             self.ok_probability = sim_config.ok_probability
+            num_workers = sim_config.num_workers
         else:
             self.part_interarrival = part_interarrival
             self.sensor_delay = sensor_delay
@@ -49,6 +80,20 @@ class SortingCellSimulator:
 
         self._part_counter = 0
 
+        # Arrived parts waiting for a free worker (started in run())
+        if num_workers <= 0:
+            raise ValueError("num_workers must be a positive integer")
+        self.num_workers = num_workers
+        self._parts_q: asyncio.Queue[int] = asyncio.Queue(maxsize=num_workers)
+        self._workers: List[asyncio.Task] = []
+
+        # Private RNG + samplers specialized for the (fixed) delay ranges
+        self._rng = random.Random()
+        rand = self._rng.random
+        self._sample_interarrival = _make_uniform_sampler(self.part_interarrival, rand)
+        self._sample_sensor_delay = _make_uniform_sampler(self.sensor_delay, rand)
+        self._sample_actuator_delay = _make_uniform_sampler(self.actuator_delay, rand)
+
         logger.info(
             "SortingCellSimulator initialized "
             "(interarrival=%s, sensor_delay=%s, actuator_delay=%s, ok_prob=%.2f)",
@@ -61,21 +106,39 @@ class SortingCellSimulator:
     async def run(self) -> None:
         """
         Main loop: generates parts at random intervals and
-        launches a processing coroutine for each part.
+        hands each part to the worker pool for processing.
         """
-        loop = asyncio.get_running_loop()
-        logger.info("SortingCellSimulator run loop started")
+        logger.info(
+            "SortingCellSimulator run loop started (workers=%d)", self.num_workers
+        )
+
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.num_workers)
+        ]
+        try:
+            await self._generate_parts()
+        finally:
+            for task in self._workers:
+                task.cancel()
+            self._workers = []
+
+    async def _generate_parts(self) -> None:
+        """Emit PART_ARRIVED events and queue parts for the workers."""
+        parts_q = self._parts_q
+        sample_interarrival = self._sample_interarrival
 
         while True:
             # Wait for the next part to arrive
-            dt = random.uniform(*self.part_interarrival)
+            dt = sample_interarrival()
             await asyncio.sleep(dt)
 
-            part_id = f"P{self._part_counter}"
+            # Integer IDs: no per-part string formatting, cheap dict hashing
+            part_id = self._part_counter
             self._part_counter += 1
-            t = loop.time()
+            t = monotonic_ns()
 
-            logger.info("PART_ARRIVED part_id=%s t=%.3f", part_id, t)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("PART_ARRIVED part_id=%d t=%.3f", part_id, t * NS_TO_S)
 
             # Emit PART_ARRIVED event
             event = Event(
@@ -85,51 +148,66 @@ class SortingCellSimulator:
             )
             await self._bus.publish(event)
 
-            # Start processing this part asynchronously
-            asyncio.create_task(self._process_part(part_id))
+            # Hand the part to a worker (waits if all workers are busy)
+            await parts_q.put(part_id)
 
-    async def _process_part(self, part_id: str) -> None:
+    async def _worker(self) -> None:
+        """Persistent consumer processing queued parts one at a time."""
+        parts_q = self._parts_q
+        while True:
+            part_id = await parts_q.get()
+            try:
+                await self._process_part(part_id)
+            except Exception:
+                logger.exception("Processing failed for part_id=%d", part_id)
+
+    async def _process_part(self, part_id: int) -> None:
         """
         Process a single part through:
         - sensor reading
         - actuator decision
         - final sorted outcome
         """
-        loop = asyncio.get_running_loop()
+        rand = self._rng.random
+        log_info = logger.isEnabledFor(logging.INFO)
 
         # Sensor phase
-        await asyncio.sleep(random.uniform(*self.sensor_delay))
-        is_ok = random.random() < self.ok_probability
+        await asyncio.sleep(self._sample_sensor_delay())
+        is_ok = rand() < self.ok_probability
         sensor_result = "ok" if is_ok else "nok"
 
-        logger.info(
-            "SENSOR_READ part_id=%s result=%s t=%.3f",
-            part_id,
-            sensor_result,
-            loop.time(),
-        )
+        t = monotonic_ns()
+        if log_info:
+            logger.info(
+                "SENSOR_READ part_id=%d result=%s t=%.3f",
+                part_id,
+                sensor_result,
+                t * NS_TO_S,
+            )
 
         e_sensor = Event(
             type=EventType.SENSOR_READ,
-            timestamp=loop.time(),
+            timestamp=t,
             data={"part_id": part_id, "result": sensor_result},
         )
         await self._bus.publish(e_sensor)
 
         # Actuator phase
-        await asyncio.sleep(random.uniform(*self.actuator_delay))
+        await asyncio.sleep(self._sample_actuator_delay())
         decision = "ok_bin" if is_ok else "reject_bin"
 
-        logger.info(
-            "ACTUATOR_TRIGGERED part_id=%s decision=%s t=%.3f",
-            part_id,
-            decision,
-            loop.time(),
-        )
+        t = monotonic_ns()
+        if log_info:
+            logger.info(
+                "ACTUATOR_TRIGGERED part_id=%d decision=%s t=%.3f",
+                part_id,
+                decision,
+                t * NS_TO_S,
+            )
 
         e_act = Event(
             type=EventType.ACTUATOR_TRIGGERED,
-            timestamp=loop.time(),
+            timestamp=t,
             data={"part_id": part_id, "decision": decision},
         )
         await self._bus.publish(e_act)
@@ -137,16 +215,18 @@ class SortingCellSimulator:
         # Final outcome
         outcome = "ok" if is_ok else "nok"
 
-        logger.info(
-            "PART_SORTED part_id=%s outcome=%s t=%.3f",
-            part_id,
-            outcome,
-            loop.time(),
-        )
+        t = monotonic_ns()
+        if log_info:
+            logger.info(
+                "PART_SORTED part_id=%d outcome=%s t=%.3f",
+                part_id,
+                outcome,
+                t * NS_TO_S,
+            )
 
         e_sorted = Event(
             type=EventType.PART_SORTED,
-            timestamp=loop.time(),
+            timestamp=t,
             data={"part_id": part_id, "outcome": outcome},
         )
         await self._bus.publish(e_sorted)
@@ -1,12 +1,109 @@
 # twin_core/event_bus.py
 
 import asyncio
-from typing import Awaitable, Callable, List
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple
 
 from common.events import Event
 
+logger = logging.getLogger(__name__)
+
 
 SubscriberCallback = Callable[[Event], Awaitable[None]]
+BatchSubscriberCallback = Callable[[List[Event]], Awaitable[None]]
+
+
+class _RingQueue:
+    """
+    Bounded FIFO of events for a single dispatcher.
+
+    - Events are stored in a preallocated ring buffer (no per-event Future).
+    - put() waits while the buffer is full (backpressure on producers).
+    - The dispatcher waits on one asyncio.Event, then drains a burst in one shot.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+        self._buf: List[Optional[Event]] = [None] * capacity
+        self._capacity = capacity
+        self._head = 0
+        self._size = 0
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+    def __len__(self) -> int:
+        return self._size
+
+    async def put(self, event: Event) -> None:
+        """Append an event, waiting for free space if the buffer is full."""
+        while self._size == self._capacity:
+            self._not_full.clear()
+            await self._not_full.wait()
+        tail = self._head + self._size
+        if tail >= self._capacity:
+            tail -= self._capacity
+        self._buf[tail] = event
+        self._size += 1
+        self._not_empty.set()
+
+    async def put_many(self, events: List[Event]) -> None:
+        """Append events in order, waiting for free space whenever full."""
+        buf = self._buf
+        capacity = self._capacity
+        for event in events:
+            while self._size == capacity:
+                self._not_full.clear()
+                self._not_empty.set()
+                await self._not_full.wait()
+            tail = self._head + self._size
+            if tail >= capacity:
+                tail -= capacity
+            buf[tail] = event
+            self._size += 1
+        self._not_empty.set()
+
+    async def wait(self) -> None:
+        """Wait until at least one event is buffered."""
+        while self._size == 0:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+    def drain(self, limit: int, out: List[Event]) -> None:
+        """Move up to `limit` buffered events (head -> tail) into `out`."""
+        n = min(self._size, limit)
+        if n <= 0:
+            return
+        buf = self._buf
+        capacity = self._capacity
+        head = self._head
+        for _ in range(n):
+            out.append(buf[head])
+            buf[head] = None
+            head += 1
+            if head == capacity:
+                head = 0
+        self._head = head
+        self._size -= n
+        self._not_full.set()
+
+
+class _Subscription:
+    """A subscriber with its own bounded queue and delivery task."""
+
+    __slots__ = ("callback", "batch_callback", "queue", "task")
+
+    def __init__(
+        self,
+        callback: SubscriberCallback,
+        batch_callback: Optional[BatchSubscriberCallback],
+        capacity: int,
+    ) -> None:
+        self.callback = callback
+        self.batch_callback = batch_callback
+        self.queue = _RingQueue(capacity)
+        self.task: Optional[asyncio.Task] = None
 
 
 class EventBus:
@@ -15,25 +112,117 @@ class EventBus:
 
     - Producers publish Event objects.
     - Consumers subscribe with async callbacks.
-    - The bus runs a loop that dispatches each event to all subscribers.
+    - The bus runs a loop that drains the queue in bursts and copies each
+      burst into every subscriber's own bounded queue.
+    - One task per subscriber delivers its queue (as a list for batch-aware
+      subscribers, one event at a time otherwise), so a slow subscriber only
+      delays itself; the bus waits on it only once its queue is full.
+    - A failing subscriber is logged and does not stop the bus.
     """
 
-    def __init__(self) -> None:
-        self._queue: asyncio.Queue[Event] = asyncio.Queue()
-        self._subscribers: List[SubscriberCallback] = []
+    def __init__(
+        self,
+        capacity: int = 4096,
+        max_batch_size: int = 64,
+        max_batch_delay: float = 0.0,
+        subscriber_capacity: int = 1024,
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be a positive integer")
+        if max_batch_delay < 0.0:
+            raise ValueError("max_batch_delay must be >= 0")
+
+        # Bounded buffer: publish() waits when `capacity` events are pending
+        self._queue = _RingQueue(capacity)
+        # Rebuilt as a tuple on subscribe() so dispatch iterates an
+        # immutable sequence.
+        self._subscribers: Tuple[_Subscription, ...] = ()
+        self.subscriber_capacity = subscriber_capacity
+        self._running = False
+
+        # Burst limits: at most max_batch_size events per dispatch, and wait
+        # at most max_batch_delay seconds after the first one for more to arrive
+        # (0.0 = only take what is already queued, no added latency).
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+
+    def subscribe(
+        self,
+        callback: SubscriberCallback,
+        batch_callback: Optional[BatchSubscriberCallback] = None,
+    ) -> None:
+        """
+        Register an async callback that will be called for every event.
 
-    def subscribe(self, callback: SubscriberCallback) -> None:
-        """Register an async callback that will be called for every event."""
-        self._subscribers.append(callback)
+        If batch_callback is given, it receives each burst as a list instead
+        and callback is not used by the dispatch loop.
+        Each subscriber gets a queue of `subscriber_capacity` events; its
+        delivery task is started by run() (or immediately if already running).
+        """
+        sub = _Subscription(callback, batch_callback, self.subscriber_capacity)
+        self._subscribers = self._subscribers + (sub,)
+        if self._running:
+            self._start_worker(sub)
 
     async def publish(self, event: Event) -> None:
-        """Publish an event to the internal queue."""
+        """Publish an event to the internal queue (waits while it is full)."""
         await self._queue.put(event)
 
-    async def _dispatch(self, event: Event) -> None:
-        """Send an event to all subscribers."""
-        for callback in self._subscribers:
-            await callback(event)
+    async def _next_batch(self) -> List[Event]:
+        """Wait for at least one event, then collect a burst of queued events."""
+        queue = self._queue
+        max_size = self.max_batch_size
+
+        batch: List[Event] = []
+        await queue.wait()
+        queue.drain(max_size, batch)
+
+        if self.max_batch_delay > 0.0 and len(batch) < max_size:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.max_batch_delay
+            while len(batch) < max_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0.0:
+                    break
+                try:
+                    await asyncio.wait_for(queue.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                queue.drain(max_size - len(batch), batch)
+
+        return batch
+
+    def _start_worker(self, sub: _Subscription) -> None:
+        sub.task = asyncio.create_task(self._worker(sub))
+
+    async def _worker(self, sub: _Subscription) -> None:
+        """Deliver a subscriber's queued events, in order, as bursts."""
+        queue = sub.queue
+        callback = sub.callback
+        batch_callback = sub.batch_callback
+        max_size = self.max_batch_size
+
+        while True:
+            await queue.wait()
+            events: List[Event] = []
+            queue.drain(max_size, events)
+            if batch_callback is not None:
+                try:
+                    await batch_callback(events)
+                except Exception:
+                    logger.exception("EventBus subscriber %r failed", batch_callback)
+                continue
+            # One failing event must not drop the rest of the burst
+            for event in events:
+                try:
+                    await callback(event)
+                except Exception:
+                    logger.exception("EventBus subscriber %r failed", callback)
+
+    async def _dispatch(self, events: List[Event]) -> None:
+        """Copy a burst of events into every subscriber queue."""
+        for sub in self._subscribers:
+            await sub.queue.put_many(events)
 
     async def run(self) -> None:
         """
@@ -42,6 +231,16 @@ class EventBus:
         This should typically be run in an asyncio task:
             asyncio.create_task(bus.run())
         """
-        while True:
-            event = await self._queue.get()
-            await self._dispatch(event)
+        self._running = True
+        for sub in self._subscribers:
+            self._start_worker(sub)
+        try:
+            while True:
+                batch = await self._next_batch()
+                await self._dispatch(batch)
+        finally:
+            self._running = False
+            for sub in self._subscribers:
+                if sub.task is not None:
+                    sub.task.cancel()
+                    sub.task = None
@@ -1,14 +1,19 @@
 # twin_core/state_model.py
 
-from enum import Enum
+from collections import deque
+from enum import Enum, IntEnum
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import ClassVar, Deque, Dict, Final, Iterable, Mapping, Optional, Tuple
 import logging
 
-from common.events import Event, EventType
+from common.events import NS_TO_S, Event, EventType
 
 logger = logging.getLogger(__name__)
 
+# How many sorted parts are kept for parts_snapshot() after leaving the system
+RECENT_PARTS_MAXLEN: Final = 1000
+
 
 class CellState(Enum):
     """High-level state of the sorting cell."""
@@ -18,25 +23,64 @@ class CellState(Enum):
     ERROR = "error"
 
 
-class PartStatus(Enum):
-    """Lifecycle status of a part inside the system."""
-    CREATED = "created"
-    ON_CONVEYOR = "on_conveyor"
-    AT_SENSOR = "at_sensor"
-    READY_TO_SORT = "ready_to_sort"
-    SORTED_OK = "sorted_ok"
-    SORTED_NOK = "sorted_nok"
+class PartStatus(IntEnum):
+    """
+    Lifecycle status of a part inside the system.
+
+    Int-valued (usable as a table index); `label` is the readable name.
+    """
+    CREATED = 0
+    ON_CONVEYOR = 1
+    AT_SENSOR = 2
+    READY_TO_SORT = 3
+    SORTED_OK = 4
+    SORTED_NOK = 5
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+# Lookup tables below are built once at import and shared read-only by all
+# TwinState instances.
+
+# PartStatus labels indexed by status, for snapshot serialization
+_STATUS_VALUE: Final[Tuple[str, ...]] = tuple(status.label for status in PartStatus)
+
+# Special cells of the transition table (real statuses are >= 0)
+_INVALID: Final = -1       # event not allowed in this status
+_BY_OUTCOME: Final = -2    # next status depends on the PART_SORTED outcome
 
+# Accepted values of the PART_SORTED "outcome" field
+_VALID_OUTCOMES: Final[frozenset[str]] = frozenset({"ok", "nok"})
 
-@dataclass
+# PART_SORTED outcome, indexed by (outcome == "ok"):
+# (final status, processed increment, rejected increment)
+_OUTCOME: Final[Tuple[Tuple[PartStatus, int, int], ...]] = (
+    (PartStatus.SORTED_NOK, 1, 1),
+    (PartStatus.SORTED_OK, 1, 0),
+)
+
+
+def _build_transition_table(
+    rules: Dict[Tuple[PartStatus, EventType], int],
+) -> Tuple[Tuple[int, ...], ...]:
+    """Expand transition rules into a [status][event type] matrix."""
+    table = [[_INVALID] * len(EventType) for _ in PartStatus]
+    for (status, etype), next_status in rules.items():
+        table[status][etype] = next_status
+    return tuple(tuple(row) for row in table)
+
+
+@dataclass(slots=True)
 class Part:
     """Representation of a part inside the system."""
-    part_id: str
+    part_id: int
     status: PartStatus
-    last_timestamp: float
+    last_timestamp: int  # ns
 
 
-@dataclass
+@dataclass(slots=True)
 class TwinState:
     """
     Digital Twin internal DES-style state with anomaly detection and metrics.
@@ -44,146 +88,290 @@ class TwinState:
     - BLOCKED when no events for too long
     - ERROR when invalid event sequence detected
     - Metrics: throughput, reject rate, observation window
+
+    `parts` only holds in-flight parts: sorted parts are moved to the
+    bounded `recent_parts` history, so memory stays O(parts in system).
+    Sorted parts never change again, so the history stores their final
+    parts_snapshot() rows directly. The ids of the last RECENT_PARTS_MAXLEN
+    sorted parts are remembered too, so a late or replayed event for one of
+    them is still an ERROR instead of silently creating a new part.
     """
 
     cell_state: CellState = CellState.IDLE
-    parts: Dict[str, Part] = field(default_factory=dict)
+    parts: Dict[int, Part] = field(default_factory=dict)
+    recent_parts: Deque[dict] = field(
+        default_factory=lambda: deque(maxlen=RECENT_PARTS_MAXLEN)
+    )
+    # Final status of recently sorted part ids (oldest first in
+    # _sorted_order, both bounded to RECENT_PARTS_MAXLEN)
+    _sorted_status: Dict[int, PartStatus] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _sorted_order: Deque[int] = field(
+        default_factory=deque, init=False, repr=False, compare=False
+    )
 
     total_processed: int = 0
     total_rejected: int = 0
 
     # Anomaly + time tracking
-    last_event_time: float = 0.0
-    system_start_time: float = 0.0
-    blocked_threshold: float = 5.0
+    # Event times are integer nanoseconds (see Event.timestamp)
+    last_event_time: int = 0
+    system_start_time: int = 0
+    blocked_threshold_ns: int = 5_000_000_000
     error_flag: bool = False
 
-    def _get_or_create_part(self, part_id: str, timestamp: float) -> Part:
-        if part_id not in self.parts:
-            self.parts[part_id] = Part(
+    # Rule-based event ordering (mirrors a realistic CPPS workflow), as a
+    # matrix indexed [status][event type]: a PartStatus, _BY_OUTCOME, or
+    # _INVALID for any pair not listed. A class constant: one immutable
+    # table shared by every instance, never copied per instance or per call.
+    _TRANSITIONS: ClassVar[Tuple[Tuple[int, ...], ...]] = _build_transition_table({
+        (PartStatus.CREATED, EventType.PART_ARRIVED): PartStatus.ON_CONVEYOR,
+        (PartStatus.ON_CONVEYOR, EventType.SENSOR_READ): PartStatus.AT_SENSOR,
+        (PartStatus.AT_SENSOR, EventType.ACTUATOR_TRIGGERED): PartStatus.READY_TO_SORT,
+        (PartStatus.READY_TO_SORT, EventType.PART_SORTED): _BY_OUTCOME,
+    })
+
+    # Snapshot caches: built on demand, reset to None on every state change
+    _snapshot_cache: Optional[dict] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _metrics_cache: Optional[dict] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _parts_cache: Optional[list] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Reused dict behind snapshot_view(), refreshed in place when stale
+    _view_dict: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _view: Mapping[str, object] = field(init=False, repr=False, compare=False)
+    _view_stale: bool = field(default=True, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._view = MappingProxyType(self._view_dict)
+
+    def _get_or_create_part(self, part_id: int, timestamp: int) -> Part:
+        parts = self.parts
+        part = parts.get(part_id)
+        if part is None:
+            part = Part(
                 part_id=part_id,
                 status=PartStatus.CREATED,
                 last_timestamp=timestamp,
             )
-        return self.parts[part_id]
+            parts[part_id] = part
+        return part
 
-    def validate_sequence(self, part: Part, event_type: EventType) -> bool:
-        """
-        Rule-based validation of event ordering.
-        This ensures the twin mirrors a realistic CPPS workflow.
+    def _invalidate_snapshots(self) -> None:
+        self._snapshot_cache = None
+        self._metrics_cache = None
+        self._parts_cache = None
+        self._view_stale = True
+
+    def check_blocked(self, current_time: int):
         """
-        valid_flow = {
-            PartStatus.CREATED:        [EventType.PART_ARRIVED],
-            PartStatus.ON_CONVEYOR:    [EventType.SENSOR_READ],
-            PartStatus.AT_SENSOR:      [EventType.ACTUATOR_TRIGGERED],
-            PartStatus.READY_TO_SORT:  [EventType.PART_SORTED],
-            PartStatus.SORTED_OK:      [],
-            PartStatus.SORTED_NOK:     [],
-        }
-        return event_type in valid_flow.get(part.status, [])
+        Detect lack of activity → BLOCKED state (current_time in ns).
 
-    def check_blocked(self, current_time: float):
-        """Detect lack of activity → BLOCKED state."""
-        if self.last_event_time == 0.0:
+        Meant to be polled with the current monotonic time; the next event
+        moves the cell back to RUNNING. An ERROR state is left as is.
+        """
+        if self.last_event_time == 0:
             return
-        if (current_time - self.last_event_time) > self.blocked_threshold:
-            if self.cell_state != CellState.BLOCKED:
+        if (current_time - self.last_event_time) > self.blocked_threshold_ns:
+            if self.cell_state is CellState.RUNNING:
                 logger.warning(
                     "CELL BLOCKED: No events for %.2fs",
-                    current_time - self.last_event_time,
+                    (current_time - self.last_event_time) * NS_TO_S,
                 )
-            self.cell_state = CellState.BLOCKED
+                self.cell_state = CellState.BLOCKED
+                self._invalidate_snapshots()
+
+    def _log_stall(self, gap_ns: int) -> None:
+        """Report an event gap longer than the threshold (rare path)."""
+        if self.cell_state is CellState.BLOCKED:
+            # Already reported by check_blocked()
+            logger.info("CELL RESUMED after %.2fs without events", gap_ns * NS_TO_S)
+        else:
+            logger.warning(
+                "CELL BLOCKED: No events for %.2fs before this event (resumed)",
+                gap_ns * NS_TO_S,
+            )
 
     def handle_event(self, event: Event) -> None:
+        # Every event changes the state (at least last_event_time)
+        self._invalidate_snapshots()
+        self._apply_event(event)
+
+    def handle_events(self, events: Iterable[Event]) -> None:
+        """
+        Apply a burst of events in order.
+
+        Same result as calling handle_event() for each event, but the
+        snapshot caches are invalidated once per burst instead of per event;
+        this is the batch ingestion entry point used by the DigitalTwin bus
+        handler.
+        """
+        self._invalidate_snapshots()
+        apply_event = self._apply_event
+        for event in events:
+            apply_event(event)
+
+    def _apply_event(self, event: Event) -> None:
+        """State-machine step for one event (caches invalidated by caller)."""
         etype = event.type
         data = event.data
         t = event.timestamp
 
-        # Update last received activity time
+        # Update last received activity time; a gap since the previous event
+        # longer than the threshold is a stall (one compare on the common
+        # path; the first event has no previous time)
+        prev_time = self.last_event_time
         self.last_event_time = t
+        if t - prev_time > self.blocked_threshold_ns and prev_time != 0:
+            self._log_stall(t - prev_time)
 
-        # First event → running + set system start time
-        if self.cell_state == CellState.IDLE:
+        state = self.cell_state
+        if state is CellState.IDLE:
+            # First event → running + set system start time
             self.cell_state = CellState.RUNNING
             self.system_start_time = t
+        elif state is CellState.BLOCKED:
+            # Activity resumed after check_blocked() flagged the cell
+            self.cell_state = CellState.RUNNING
 
         part_id = data.get("part_id")
+        sorted_status = self._sorted_status.get(part_id)
+        if sorted_status is not None:
+            # Part already left the system: sorted parts accept no events
+            self.cell_state = CellState.ERROR
+            self.error_flag = True
+            logger.error(
+                "INVALID EVENT ORDER: part=%s status=%s event=%s",
+                part_id,
+                sorted_status.label,
+                etype.label,
+            )
+            return
         part = self._get_or_create_part(part_id, t)
 
-        # Validate event sequence
-        if not self.validate_sequence(part, etype):
+        # Validate + transition in one lookup
+        new_status = self._TRANSITIONS[part.status][etype]
+        if new_status == _INVALID:
             self.cell_state = CellState.ERROR
             self.error_flag = True
             logger.error(
                 "INVALID EVENT ORDER: part=%s status=%s event=%s",
                 part_id,
-                part.status.value,
-                etype.value,
+                part.status.label,
+                etype.label,
             )
             return
 
-        # Apply transitions
-        if etype == EventType.PART_ARRIVED:
-            part.status = PartStatus.ON_CONVEYOR
-            part.last_timestamp = t
-
-        elif etype == EventType.SENSOR_READ:
-            part.status = PartStatus.AT_SENSOR
-            part.last_timestamp = t
-
-        elif etype == EventType.ACTUATOR_TRIGGERED:
-            part.status = PartStatus.READY_TO_SORT
+        if new_status == _BY_OUTCOME:
+            self._apply_sorted_outcome(part, data, t)
+        else:
+            part.status = new_status
             part.last_timestamp = t
 
-        elif etype == EventType.PART_SORTED:
-            outcome = data["outcome"]
-            if outcome == "ok":
-                part.status = PartStatus.SORTED_OK
-                self.total_processed += 1
-            else:
-                part.status = PartStatus.SORTED_NOK
-                self.total_processed += 1
-                self.total_rejected += 1
-
-            part.last_timestamp = t
+    def _apply_sorted_outcome(self, part: Part, data: dict, t: int) -> None:
+        """PART_SORTED: final status from the outcome, counters, eviction."""
+        outcome = data.get("outcome")
+        if outcome not in _VALID_OUTCOMES:
+            # Missing / unknown outcome: invalid payload, part stays unsorted
+            self.cell_state = CellState.ERROR
+            self.error_flag = True
+            logger.error(
+                "INVALID OUTCOME: part=%s outcome=%r", part.part_id, outcome
+            )
+            return
 
+        part.status, processed, rejected = _OUTCOME[outcome == "ok"]
+        part.last_timestamp = t
+        self.total_processed += processed
+        self.total_rejected += rejected
+
+        # Part has left the system: evict it, keep it in the bounded history
+        del self.parts[part.part_id]
+        self.recent_parts.append(self._part_row(part))
+        sorted_order = self._sorted_order
+        if len(sorted_order) == RECENT_PARTS_MAXLEN:
+            del self._sorted_status[sorted_order.popleft()]
+        sorted_order.append(part.part_id)
+        self._sorted_status[part.part_id] = part.status
+
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
                 "PART_SORTED: part=%s outcome=%s processed=%d rejected=%d",
-                part_id,
+                part.part_id,
                 outcome,
                 self.total_processed,
                 self.total_rejected,
             )
 
-        # Check if BLOCKED (based on event time)
-        self.check_blocked(t)
-
-    def get_part(self, part_id: str) -> Optional[Part]:
+    def get_part(self, part_id: int) -> Optional[Part]:
+        """Return an in-flight part (sorted parts are no longer tracked here)."""
         return self.parts.get(part_id)
 
+    @staticmethod
+    def _part_row(part: Part) -> dict:
+        return {
+            "part_id": part.part_id,
+            "status": _STATUS_VALUE[part.status],
+            "last_timestamp": part.last_timestamp * NS_TO_S,
+        }
+
     def parts_snapshot(self) -> list[dict]:
         """
-        Return a list of parts with their status and last timestamp.
+        Return a list of parts with their status and last timestamp:
+        recently sorted parts followed by the parts still in the system.
         Useful for monitoring / dashboards.
+
+        The list is cached until the next state change: treat it (and its
+        rows) as read-only.
         """
-        return [
-            {
-                "part_id": part.part_id,
-                "status": part.status.value,
-                "last_timestamp": part.last_timestamp,
-            }
-            for part in self.parts.values()
-        ]
+        rows = self._parts_cache
+        if rows is None:
+            rows = list(self.recent_parts)
+            part_row = self._part_row
+            rows.extend([part_row(part) for part in self.parts.values()])
+            self._parts_cache = rows
+        return rows
 
     def snapshot(self) -> dict:
-        """Return a JSON-serializable state."""
-        return {
-            "cell_state": self.cell_state.value,
-            "total_processed": self.total_processed,
-            "total_rejected": self.total_rejected,
-            "parts_in_system": len(self.parts),
-            "error": self.error_flag,
-        }
+        """
+        Return a JSON-serializable state.
+
+        The dict is cached until the next state change: treat it as read-only.
+        """
+        if self._snapshot_cache is None:
+            self._snapshot_cache = {
+                "cell_state": self.cell_state.value,
+                "total_processed": self.total_processed,
+                "total_rejected": self.total_rejected,
+                "parts_in_system": len(self.parts),
+                "error": self.error_flag,
+            }
+        return self._snapshot_cache
+
+    def snapshot_view(self) -> Mapping[str, object]:
+        """
+        Return a read-only view with the same content as snapshot().
+
+        Always the same MappingProxyType object: its underlying dict is
+        updated in place when the state has changed, so reads never allocate.
+        The view reflects later changes; copy it (dict(view)) to keep a
+        point-in-time snapshot.
+        """
+        if self._view_stale:
+            view_dict = self._view_dict
+            view_dict["cell_state"] = self.cell_state.value
+            view_dict["total_processed"] = self.total_processed
+            view_dict["total_rejected"] = self.total_rejected
+            view_dict["parts_in_system"] = len(self.parts)
+            view_dict["error"] = self.error_flag
+            self._view_stale = False
+        return self._view
 
     def metrics_snapshot(self) -> dict:
         """
@@ -191,11 +379,16 @@ class TwinState:
         - throughput: parts / second over observation window
         - reject_rate: ratio of rejected parts
         - observation_window: duration between first and last event
+
+        Like snapshot(), the dict is cached until the next state change.
         """
-        if self.system_start_time == 0.0 or self.last_event_time <= self.system_start_time:
+        if self._metrics_cache is not None:
+            return self._metrics_cache
+
+        if self.system_start_time == 0 or self.last_event_time <= self.system_start_time:
             observation_window = 0.0
         else:
-            observation_window = self.last_event_time - self.system_start_time
+            observation_window = (self.last_event_time - self.system_start_time) * NS_TO_S
 
         if observation_window > 0.0:
             throughput = self.total_processed / observation_window
@@ -207,10 +400,11 @@ class TwinState:
         else:
             reject_rate = 0.0
 
-        return {
+        self._metrics_cache = {
             "total_processed": self.total_processed,
             "total_rejected": self.total_rejected,
             "reject_rate": reject_rate,
             "throughput": throughput,
             "observation_window": observation_window,
         }
+        return self._metrics_cache
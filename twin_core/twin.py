@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
+from time import monotonic_ns
+from typing import Mapping
 
 from common.events import Event
 from twin_core.event_bus import EventBus
@@ -19,17 +20,18 @@ class DigitalTwin:
     - Subscribes to events from the EventBus.
     - Updates its internal TwinState.
     - Exposes methods to query state, parts, and KPIs.
+
+    All access happens on the event loop thread and TwinState methods never
+    await, so event handling and snapshot reads cannot interleave: no lock
+    is needed.
     """
 
     def __init__(self, bus: EventBus, blocked_threshold: float = 5.0) -> None:
         self._bus = bus
-        # Inject blocked_threshold into state
-        self._state = TwinState(blocked_threshold=blocked_threshold)
-        # Register our async handler to the bus
-        self._bus.subscribe(self._handle_event)
-
-        # This lock protects state reads/writes if needed
-        self._lock = asyncio.Lock()
+        # Inject blocked_threshold into state (seconds -> integer ns)
+        self._state = TwinState(blocked_threshold_ns=round(blocked_threshold * 1e9))
+        # Register our async handlers to the bus
+        self._bus.subscribe(self._handle_event, batch_callback=self._handle_events)
 
         logger.info(
             "DigitalTwin initialized (blocked_threshold=%.2f) and subscribed to EventBus",
@@ -38,21 +40,36 @@ class DigitalTwin:
 
     async def _handle_event(self, event: Event) -> None:
         """Callback invoked by the EventBus for each new event."""
-        async with self._lock:
-            logger.debug("DigitalTwin received event type=%s", event.type.value)
-            self._state.handle_event(event)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DigitalTwin received event type=%s", event.type.label)
+        self._state.handle_event(event)
+
+    async def _handle_events(self, events: list[Event]) -> None:
+        """Batch callback invoked by the EventBus for a burst of events."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DigitalTwin received batch of %d events", len(events))
+        self._state.handle_events(events)
 
     async def get_state_snapshot(self) -> dict:
-        """Return a thread-safe snapshot of the twin state."""
-        async with self._lock:
-            return self._state.snapshot()
+        """Return a snapshot of the twin state (BLOCKED is checked on read)."""
+        # Event timestamps come from the same monotonic clock
+        self._state.check_blocked(monotonic_ns())
+        return self._state.snapshot()
+
+    async def get_state_view(self) -> Mapping[str, object]:
+        """
+        Return the live read-only view of the twin state.
+
+        Allocation-free alternative to get_state_snapshot() for in-process
+        readers; the view keeps changing as events arrive.
+        """
+        self._state.check_blocked(monotonic_ns())
+        return self._state.snapshot_view()
 
     async def get_parts_snapshot(self) -> list[dict]:
-        """Return a thread-safe list of part states."""
-        async with self._lock:
-            return self._state.parts_snapshot()
+        """Return a list of part states."""
+        return self._state.parts_snapshot()
 
     async def get_metrics_snapshot(self) -> dict:
-        """Return a thread-safe snapshot of KPIs / metrics."""
-        async with self._lock:
-            return self._state.metrics_snapshot()
+        """Return a snapshot of KPIs / metrics."""
+        return self._state.metrics_snapshot()